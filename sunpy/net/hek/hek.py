@@ -5,12 +5,15 @@ import json
 import codecs
 import urllib
 import inspect
+import threading
+from types import MappingProxyType
 from itertools import chain
+from concurrent.futures import Future
 
 import numpy.ma
 
 import astropy.table
-from astropy.table import Row
+from astropy.table import MaskedColumn, Row
 
 import sunpy.net._attrs as core_attrs
 from sunpy import log
@@ -18,21 +21,119 @@ from sunpy.net import attr
 from sunpy.net.base_client import BaseClient, QueryResponseTable
 from sunpy.net.hek import attrs
 from sunpy.time import parse_time
-from sunpy.util import dict_keys_same, unique
 from sunpy.util.xml import xml_to_dict
 
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = ['HEKClient', 'HEKTable', 'HEKRow']
 
 DEFAULT_URL = 'https://www.lmsal.com/hek/her?'
 
+# Timeout in seconds for each request to the HEK.
+_TIMEOUT = 120
+
+# One simdjson parser per thread, reused across pages so its internal buffers
+# are only allocated once.
+_PARSERS = threading.local()
+
+
+def _parse_response(raw):
+    """
+    Parse the raw bytes of a HEK JSON response.
+
+    Returns the list of result rows and the ``overmax`` flag. If ``pysimdjson``
+    is installed only these two fields are converted into Python objects.
+    """
+    if simdjson is not None:
+        parser = getattr(_PARSERS, 'parser', None)
+        if parser is None:
+            parser = _PARSERS.parser = simdjson.Parser()
+        try:
+            doc = parser.parse(raw)
+            rows, overmax = [row.as_dict() for row in doc['result']], doc['overmax']
+        except Exception:
+            # The traceback can keep the document alive, which stops the parser
+            # from being reused, so start again with a new one.
+            _PARSERS.parser = None
+            raise
+        # The document has to be released before the parser can be reused.
+        del doc
+        return rows, overmax
+    result = json.loads(codecs.decode(raw, encoding='utf-8', errors='replace'))
+    return result['result'], result['overmax']
+
+
+def _fetch_in_background(fetch, page):
+    """
+    Call ``fetch(page)`` in a daemon thread and return a future for the result.
+
+    Daemon threads are used so that a speculative request for a page past the
+    end of the results never stops the interpreter from exiting.
+    """
+    future = Future()
+
+    def _run():
+        try:
+            future.set_result(fetch(page))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run, daemon=True).start()
+    return future
+
+
+def _rows_to_columns(rows):
+    """
+    Convert a list of result dicts into a dict of columns.
+
+    Keys missing from a row are filled with `None`, so every column has
+    one entry per row.
+    """
+    columns = {}
+    for i, row in enumerate(rows):
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = [None] * i
+                columns[key] = column
+            column.append(value)
+        for column in columns.values():
+            if len(column) == i:
+                column.append(None)
+    return columns
+
+
+def _empty_mask(column):
+    """
+    Return a boolean array which is `True` where ``column`` has no value.
+    """
+    values = numpy.asarray(column)
+    return numpy.ma.getmaskarray(column) | (values == "") | (values == None)  # NOQA: E711
+
+
+def _freeze_default(obj):
+    # NumPy scalars are frozen as the equivalent Python value so the key does
+    # not depend on the dtype of the column the value came from.
+    if isinstance(obj, numpy.generic):
+        return obj.item()
+    return str(obj)
+
 
 def _freeze(obj):
     """ Create hashable representation of result dict. """
-    if isinstance(obj, dict):
-        return tuple((k, _freeze(v)) for k, v in obj.items())
-    if isinstance(obj, list):
-        return tuple(_freeze(elem) for elem in obj)
-    return obj
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                            default=_freeze_default)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                      default=_freeze_default).encode()
 
 
 class HEKClient(BaseClient):
@@ -41,6 +142,12 @@ class HEKClient(BaseClient):
 
     The HEK stores solar feature and event data generated by algorithms and
     human observers.
+
+    If `pysimdjson <https://pysimdjson.tkte.ch/>`__ and `orjson
+    <https://github.com/ijl/orjson>`__ are installed (both are part of the
+    ``net`` extra), they are used to parse the responses and to de-duplicate
+    merged results respectively, otherwise the standard library `json` module
+    is used.
     """
     # FIXME: Expose fields in .attrs with the right types
     # that is, not all StringParamWrapper!
@@ -53,40 +160,51 @@ class HEKClient(BaseClient):
     }
     # Default to full disk.
     attrs.walker.apply(attrs.SpatialRegion(), {}, default)
+    # Shared by every query, so make it read-only.
+    default = MappingProxyType(default)
 
     def __init__(self, url=DEFAULT_URL):
         self.url = url
 
     def _download(self, data):
         """ Download all data, even if paginated. """
-        page = 1
-        results = []
-        new_data = data.copy()
-        # Override the default name of the operatorX, where X is a number.
-        for key in data.keys():
-            if "operator" in key:
-                new_data[f"op{key.split('operator')[-1]}"] = new_data.pop(key)
-        while True:
-            new_data['page'] = page
-            url = self.url + urllib.parse.urlencode(new_data)
+        data = {**self.default, **data}
+
+        def _fetch_page(page):
+            url = self.url + urllib.parse.urlencode({**data, 'page': page})
             log.debug(f'Opening {url}')
-            fd = urllib.request.urlopen(url)
+            with urllib.request.urlopen(url, timeout=_TIMEOUT) as fd:
+                return fd.read()
+
+        def _load_page(raw):
             try:
-                result = codecs.decode(fd.read(), encoding='utf-8', errors='replace')
-                result = json.loads(result)
+                return _parse_response(raw)
             except Exception as e:
                 raise OSError("Failed to load return from the HEKClient.") from e
-            finally:
-                fd.close()
-            results.extend(result['result'])
-            if not result['overmax']:
-                if len(results) > 0:
-                    table = astropy.table.Table(dict_keys_same(results))
-                    table = self._parse_times(table)
-                    return table
-                else:
-                    return astropy.table.Table()
-            page += 1
+
+        results, overmax = _load_page(_fetch_page(1))
+        if overmax:
+            # Whether another page exists is only known once the previous one
+            # has arrived, so request the following page while waiting for the
+            # current one. At most one request past the last page is wasted.
+            page = 2
+            future = _fetch_in_background(_fetch_page, page)
+            while overmax:
+                current, future = future, _fetch_in_background(_fetch_page, page + 1)
+                page += 1
+                rows, overmax = _load_page(current.result())
+                results.extend(rows)
+        return results
+
+    @classmethod
+    def _make_table(cls, results):
+        """ Build the table of results from the list of result dicts. """
+        if len(results) > 0:
+            table = astropy.table.Table(_rows_to_columns(results))
+            table = cls._parse_times(table)
+            return table
+        else:
+            return astropy.table.Table()
 
     @staticmethod
     def _parse_times(table):
@@ -94,9 +212,17 @@ class HEKClient(BaseClient):
         time_keys = ['event_endtime', 'event_starttime', 'event_peaktime']
         for tkey in time_keys:
             if tkey in table.colnames:
-                table[tkey] = [
-                    (parse_time(time, format='iso') if time else numpy.ma.masked) for time in table[tkey]
-                ]
+                empty = _empty_mask(table[tkey])
+                # Columns containing null have object dtype, which Time will not parse.
+                values = numpy.asarray(table[tkey])
+                if not empty.any():
+                    table[tkey] = parse_time(values.astype(str))
+                    continue
+                times = numpy.empty(len(table), dtype=object)
+                if not empty.all():
+                    # Parse all the non-empty entries in one go and scatter them back.
+                    times[~empty] = parse_time(values[~empty].astype(str))
+                table.replace_column(tkey, MaskedColumn(times, name=tkey, mask=empty))
         return table
 
     def search(self, *args, **kwargs):
@@ -124,20 +250,24 @@ class HEKClient(BaseClient):
         <BLANKLINE>
         """
         query = attr.and_(*args)
-        data = attrs.walker.create(query, {})
-        ndata = []
-        for elem in data:
-            new = self.default.copy()
-            new.update(elem)
-            ndata.append(new)
+        ndata = attrs.walker.create(query, {})
         if len(ndata) == 1:
-            return HEKTable(self._download(ndata[0]), client=self)
+            results = self._download(ndata[0])
         else:
-            return HEKTable(self._merge(self._download(data) for data in ndata), client=self)
+            results = self._merge(self._download(data) for data in ndata)
+        return HEKTable(self._make_table(results), client=self)
 
     def _merge(self, responses):
         """ Merge responses, removing duplicates. """
-        return list(unique(chain.from_iterable(responses), _freeze))
+        seen = set()
+        merged = []
+        for row in chain.from_iterable(responses):
+            key = _freeze(row)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(row)
+        return merged
 
     def fetch(self, *args, **kwargs):
         """
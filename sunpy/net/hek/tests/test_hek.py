@@ -1,4 +1,9 @@
+import io
 import copy
+import json
+import time
+import urllib
+import threading
 
 import numpy as np
 import pytest
@@ -61,49 +66,49 @@ def test_eventtype_or():
 def test_HEKAttr():
     res = hek.attrs.walker.create(hek.attrs.HEKAttr("foo", "=", "bar"), {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '=', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '=', 'param0': 'foo'}
 
 
 def test_stringwrapper_eq(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap == "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '=', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '=', 'param0': 'foo'}
 
 
 def test_stringwrapper_lt(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap < "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '<', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '<', 'param0': 'foo'}
 
 
 def test_stringwrapper_gt(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap > "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '>', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '>', 'param0': 'foo'}
 
 
 def test_stringwrapper_le(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap <= "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '<=', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '<=', 'param0': 'foo'}
 
 
 def test_stringwrapper_ge(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap >= "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '>=', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '>=', 'param0': 'foo'}
 
 
 def test_stringwrapper_ne(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap != "bar", {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': '!=', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': '!=', 'param0': 'foo'}
 
 
 def test_stringwrapper_like(foostrwrap):
     res = hek.attrs.walker.create(foostrwrap.like("bar"), {})
     assert len(res) == 1
-    assert res[0] == {'value0': 'bar', 'operator0': 'like', 'param0': 'foo'}
+    assert res[0] == {'value0': 'bar', 'op0': 'like', 'param0': 'foo'}
 
 
 def test_err_dummyattr_create():
@@ -228,3 +233,154 @@ def test_missing_times():
     results = client.search(attrs.Time('2024-05-10', '2024-05-12'), attrs.hek.AR.NOAANum == 13664)
     assert isinstance(results["event_peaktime"][0], np.ma.core.MaskedConstant)
     assert results["event_peaktime"][6].isot == "2024-05-10T16:08:00.000"
+
+
+@pytest.mark.parametrize("use_simdjson", [True, False])
+def test_parse_response(use_simdjson, monkeypatch):
+    if use_simdjson:
+        pytest.importorskip("simdjson")
+    else:
+        monkeypatch.setattr(hek.hek, "simdjson", None)
+    raw = b'{"result": [{"a": 1, "b": [1, 2]}, {"a": "\\u00e9"}], "overmax": true}'
+    rows, overmax = hek.hek._parse_response(raw)
+    assert rows == [{'a': 1, 'b': [1, 2]}, {'a': 'é'}]
+    assert overmax is True
+    # The parser has to be reusable for the following pages
+    rows, overmax = hek.hek._parse_response(b'{"result": [], "overmax": false}')
+    assert rows == []
+    assert overmax is False
+
+
+def test_merge():
+    # Results shared between the responses of OR-ed queries should only appear once
+    first = [{'SOL_standard': 'a', 'event_starttime': '2011-08-09T07:19:00', 'fl_goescls': 'M2.5'},
+             {'SOL_standard': 'b', 'event_starttime': '2011-08-09T07:48:00', 'fl_goescls': None}]
+    second = [{'SOL_standard': 'b', 'event_starttime': '2011-08-09T07:48:00', 'fl_goescls': None},
+              {'SOL_standard': 'c', 'event_starttime': '2011-08-09T08:05:00', 'ar_noaanum': 11263}]
+    client = hek.HEKClient()
+    merged = client._merge([first, second])
+    assert merged == [first[0], first[1], second[1]]
+    table = hek.hek.HEKTable(client._make_table(merged), client=client)
+    assert list(table['SOL_standard']) == ['a', 'b', 'c']
+    assert isinstance(table['event_starttime'], Time)
+    assert table['ar_noaanum'][0] is None
+
+
+@pytest.fixture
+def fake_hek(monkeypatch):
+    """
+    Replace the HEK server with ``pages``, a dict mapping the value of the
+    query parameter to the list of result pages for it.
+    """
+    pages = {}
+    requested = []
+
+    def urlopen(url, *args, **kwargs):
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        value = next((v for k, v in query.items() if k.startswith('value')), None)
+        page = int(query['page'])
+        requested.append((value, page))
+        results = pages[value]
+        response = {'result': results[page - 1] if page <= len(results) else [],
+                    'overmax': page < len(results)}
+        return io.BytesIO(json.dumps(response).encode())
+
+    monkeypatch.setattr(urllib.request, 'urlopen', urlopen)
+    return pages, requested
+
+
+def test_or_query(fake_hek):
+    pages, requested = fake_hek
+    pages['A'] = [[{'SOL_standard': 'a', 'event_starttime': '2011-08-09T07:19:00'},
+                   {'SOL_standard': 'b', 'event_starttime': '2011-08-09T07:48:00'}]]
+    pages['B'] = [[{'SOL_standard': 'b', 'event_starttime': '2011-08-09T07:48:00'},
+                   {'SOL_standard': 'c', 'event_starttime': '2011-08-09T08:05:00'}]]
+    client = hek.HEKClient()
+    result = client.search(attrs.Time('2011/08/09 07:00', '2011/08/09 09:00'),
+                           (attrs.hek.FRM.Name == 'A') | (attrs.hek.FRM.Name == 'B'))
+    assert isinstance(result, hek.hek.HEKTable)
+    assert list(result['SOL_standard']) == ['a', 'b', 'c']
+    assert sorted(requested) == [('A', 1), ('B', 1)]
+
+
+def test_pagination(fake_hek):
+    pages, requested = fake_hek
+    # Three overmax pages followed by the final page
+    pages[None] = [[{'SOL_standard': f'{page}-{i}', 'event_starttime': '2011-08-09T07:19:00'}
+                    for i in range(2)] for page in range(4)]
+    client = hek.HEKClient()
+    result = client.search(attrs.Time('2011/08/09 07:00', '2011/08/09 09:00'), attrs.hek.FL)
+    assert list(result['SOL_standard']) == [f'{page}-{i}' for page in range(4) for i in range(2)]
+    requested_pages = [page for _, page in requested]
+    assert len(requested_pages) == len(set(requested_pages))
+    assert set(range(1, 5)) <= set(requested_pages)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_freeze(use_orjson, monkeypatch):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(hek.hek, "orjson", None)
+    row = {'b': 2, 'a': [1.5, None, 'é'], 'c': True}
+    key = hek.hek._freeze(row)
+    assert key == b'{"a":[1.5,null,"\xc3\xa9"],"b":2,"c":true}'
+    # The key must not depend on the order of the keys or the type of the values
+    assert hek.hek._freeze({'c': np.bool_(True), 'b': np.int64(2), 'a': [np.float64(1.5), None, 'é']}) == key
+
+
+def test_parse_times_no_missing():
+    # HEK sends ISO times with a "T" separator
+    results = [{'event_starttime': '2011-08-09T07:19:00', 'event_endtime': '2011-08-09T07:48:00'},
+               {'event_starttime': '2011-08-09T07:48:00', 'event_endtime': '2011-08-09T08:05:00'}]
+    table = hek.HEKClient._make_table(results)
+    assert isinstance(table['event_starttime'], Time)
+    assert isinstance(table['event_endtime'], Time)
+    assert table['event_starttime'][1].isot == '2011-08-09T07:48:00.000'
+    assert table['event_endtime'][1].isot == '2011-08-09T08:05:00.000'
+
+
+def test_parse_times():
+    results = [
+        {'event_starttime': '2011-08-09T07:19:00', 'event_endtime': '', 'event_peaktime': ''},
+        {'event_starttime': '2011-08-09T07:48:00', 'event_endtime': '2011-08-09T08:05:00', 'event_peaktime': ''},
+        {'event_starttime': '2011-08-09T08:05:00', 'event_endtime': None},
+    ]
+    table = hek.HEKClient._make_table(results)
+    # No missing values
+    assert isinstance(table['event_starttime'], Time)
+    assert table['event_starttime'][1].isot == '2011-08-09T07:48:00.000'
+    # Both "" and null are masked
+    assert isinstance(table['event_endtime'][0], np.ma.core.MaskedConstant)
+    assert isinstance(table['event_endtime'][2], np.ma.core.MaskedConstant)
+    assert table['event_endtime'][1].isot == '2011-08-09T08:05:00.000'
+    # No values at all, "" and the null padding for the missing key
+    assert table['event_peaktime'].mask.all()
+
+
+def test_pagination_does_not_wait_for_prefetch(fake_hek, monkeypatch):
+    pages, requested = fake_hek
+    pages[None] = [[{'SOL_standard': f'{page}', 'event_starttime': '2011-08-09T07:19:00'}] for page in range(2)]
+    release = threading.Event()
+    spare_threads = []
+    fake_urlopen = urllib.request.urlopen
+
+    def urlopen(url, *args, **kwargs):
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        if int(query['page']) > len(pages[None]):
+            # A request past the last page which is slow to answer
+            spare_threads.append(threading.current_thread())
+            release.wait(timeout=10)
+        return fake_urlopen(url, *args, **kwargs)
+
+    monkeypatch.setattr(urllib.request, 'urlopen', urlopen)
+    try:
+        start = time.monotonic()
+        result = hek.HEKClient().search(attrs.Time('2011/08/09 07:00', '2011/08/09 09:00'), attrs.hek.FL)
+        # The search returned without waiting for the spare request
+        assert time.monotonic() - start < 5
+        assert list(result['SOL_standard']) == ['0', '1']
+        assert all(thread.daemon for thread in spare_threads)
+    finally:
+        release.set()
+    assert len(spare_threads) <= 1
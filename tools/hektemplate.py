@@ -179,7 +179,7 @@ def _a(wlk, root, state, dct):
         state[HEKAttr] = 0
     nid = state[HEKAttr]
     dct[f'param{nid:d}'] = root.name
-    dct[f'operator{nid:d}'] = root.operator
+    dct[f'op{nid:d}'] = root.operator
     dct[f'value{nid:d}'] = root.value
     state[HEKAttr] += 1
     return dct